@@ -1,9 +1,30 @@
 from __future__ import annotations
 
+import gc
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import tempfile
+import time
 import unittest
-from unittest.mock import patch
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
 
-from twitch_checker.twitch_checker import TwitchService, create_app
+import requests
+
+from twitch_checker import twitch_checker
+from twitch_checker.twitch_checker import (
+    StreamStateStore,
+    TwitchService,
+    build_logger,
+    create_app,
+    load_config,
+    load_ml_models,
+    parse_timestamp,
+)
 
 
 SAMPLE_DASHBOARD = {
@@ -373,5 +394,359 @@ class AppRoutesTest(unittest.TestCase):
         self.assertEqual(response.status_code, 400)
 
 
+class HelpersTest(unittest.TestCase):
+    def test_parse_timestamp_handles_helix_and_isoformat_stamps(self) -> None:
+        expected = datetime(2026, 4, 6, 12, 30, 5, tzinfo=timezone.utc)
+
+        self.assertEqual(parse_timestamp("2026-04-06T12:30:05Z"), expected)
+        self.assertEqual(parse_timestamp("2026-04-06T12:30:05+00:00"), expected)
+        self.assertIsNone(parse_timestamp("2026-04-06T12:3x:05Z"))
+        self.assertIsNone(parse_timestamp("2026-04-06T1 :+0:05Z"))
+        self.assertIsNone(parse_timestamp("2026x04y06T12:30:05Z"))
+        self.assertIsNone(parse_timestamp("2026-04-06T12:30:0\u0665Z"))
+        self.assertIsNone(parse_timestamp(""))
+
+    def test_broken_ml_import_disables_ml_instead_of_raising(self) -> None:
+        load_ml_models.cache_clear()
+        self.addCleanup(load_ml_models.cache_clear)
+        with patch.object(twitch_checker, "ML_AVAILABLE", True), patch.dict(
+            sys.modules, {"twitch_checker.ml_models": None, "ml_models": None}
+        ):
+            self.assertIsNone(load_ml_models())
+            self.assertFalse(twitch_checker.ML_AVAILABLE)
+            self.assertIsNone(load_ml_models())
+
+
+class LogFileTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.log_path = Path(self.tmp.name) / "logs" / "app.log"
+        patcher = patch.dict(os.environ, {"LOG_FILE": str(self.log_path)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.logger = logging.getLogger("audience-signal-lab")
+        self.addCleanup(self.remove_file_handlers)
+
+    def remove_file_handlers(self) -> None:
+        for handler in list(self.logger.handlers):
+            if isinstance(handler, logging.handlers.MemoryHandler):
+                self.logger.removeHandler(handler)
+                handler.close()
+
+    def buffered_handler(self) -> logging.handlers.MemoryHandler:
+        handlers = [handler for handler in self.logger.handlers if isinstance(handler, logging.handlers.MemoryHandler)]
+        self.assertEqual(len(handlers), 1)
+        return handlers[0]
+
+    def read_log(self) -> str:
+        return self.log_path.read_text(encoding="utf-8") if self.log_path.exists() else ""
+
+    def test_file_handler_is_attached_once(self) -> None:
+        build_logger()
+        build_logger()
+        create_app()
+
+        self.buffered_handler()
+
+    def test_records_are_buffered_until_flush_or_error(self) -> None:
+        logger = build_logger()
+
+        logger.info("buffered line")
+        self.assertNotIn("buffered line", self.read_log())
+        self.buffered_handler().flush()
+        self.assertIn("buffered line", self.read_log())
+
+        logger.info("before the error")
+        logger.error("something broke")
+        contents = self.read_log()
+        self.assertIn("before the error", contents)
+        self.assertIn("something broke", contents)
+
+    def test_records_are_flushed_periodically(self) -> None:
+        with patch.object(twitch_checker, "LOG_FLUSH_SECONDS", 0.05):
+            logger = build_logger()
+            logger.info("timer line")
+            deadline = time.monotonic() + 2
+            while "timer line" not in self.read_log() and time.monotonic() < deadline:
+                time.sleep(0.02)
+
+        self.assertIn("timer line", self.read_log())
+
+
+class TwitchServiceTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        for name, filename in (("STATE_PATH", "stream_state.json"), ("TOKEN_PATH", "twitch_token.json")):
+            patcher = patch(f"twitch_checker.twitch_checker.{name}", Path(self.tmp.name) / filename)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.service = TwitchService(load_config(), build_logger())
+
+    def test_fetch_streams_batches_logins_per_helix_limit(self) -> None:
+        logins = [f"streamer_{index:03d}" for index in range(150)]
+        calls: list[list[tuple[str, str]]] = []
+
+        def fake_request(endpoint, params=None):
+            calls.append(params)
+            return {"data": [{"user_login": params[0][1].upper(), "viewer_count": 1, "tags": ["English"]}]}
+
+        with patch.object(self.service, "_request", side_effect=fake_request):
+            streams = self.service._fetch_streams(logins)
+
+        self.assertEqual([len(params) for params in calls], [100, 50])
+        self.assertEqual(set(streams), {"streamer_000", "streamer_100"})
+        self.assertEqual(streams["streamer_100"], {"user_login": "STREAMER_100", "viewer_count": 1})
+
+    def test_ensure_token_reuses_cached_token_from_disk(self) -> None:
+        self.service.config.client_id = "abc123"
+        self.service.config.client_secret = "secret"
+        token_path = Path(self.tmp.name) / "twitch_token.json"
+        token_path.write_text(
+            json.dumps({"client_id": "abc123", "access_token": "cached", "expires_at": time.time() + 3600}),
+            encoding="utf-8",
+        )
+        with patch.object(self.service.session, "post") as post:
+            self.service.ensure_token()
+
+        post.assert_not_called()
+        self.assertEqual(self.service.access_token, "cached")
+        self.assertEqual(self.service._headers, {"Client-ID": "abc123", "Authorization": "Bearer cached"})
+
+    def test_malformed_token_cache_is_treated_as_a_miss(self) -> None:
+        self.service.config.client_id = "abc123"
+        self.service.config.client_secret = "secret"
+        token_path = Path(self.tmp.name) / "twitch_token.json"
+        response = MagicMock(status_code=200, content=b'{"access_token": "fresh", "expires_in": 3600}')
+
+        for corrupt in ('{"client_id": "abc123", "access_token": "x", "expires_at": "soon"}', "[1, 2]", "{not json"):
+            token_path.write_text(corrupt, encoding="utf-8")
+            self.service.access_token = ""
+            with patch.object(self.service.session, "post", return_value=response) as post:
+                self.service.ensure_token()
+            post.assert_called_once()
+            self.assertEqual(self.service.access_token, "fresh")
+
+        self.assertEqual(token_path.stat().st_mode & 0o777, 0o600)
+        self.assertEqual(json.loads(token_path.read_text(encoding="utf-8"))["access_token"], "fresh")
+
+    def test_failed_rebuild_backs_off_and_serves_stale_dashboard(self) -> None:
+        self.service._dashboard_cache = SAMPLE_DASHBOARD
+        self.service._dashboard_cached_at = time.monotonic() - 10_000
+        build = MagicMock(side_effect=requests.ConnectionError("down"))
+
+        with patch.object(self.service, "_build_dashboard", build):
+            with self.assertRaises(requests.ConnectionError):
+                self.service._get_cached_dashboard()
+            dashboard = self.service._get_cached_dashboard(force_refresh=True)
+
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(dashboard["generated_at"], SAMPLE_DASHBOARD["generated_at"])
+        self.assertGreater(self.service._backoff_until, time.time())
+
+    def test_http_session_leaves_rate_limits_and_read_timeouts_to_the_service(self) -> None:
+        retry = self.service.session.get_adapter("https://api.twitch.tv").max_retries
+
+        self.assertNotIn(429, retry.status_forcelist)
+        self.assertEqual(retry.read, 0)
+
+    def test_low_rate_limit_budget_defers_until_reset(self) -> None:
+        response = MagicMock(status_code=200, headers={"Ratelimit-Remaining": "3", "Ratelimit-Reset": str(int(time.time()) + 20)})
+
+        self.service._note_rate_limit(response)
+
+        self.assertGreater(self.service._backoff_until, time.time() + 10)
+
+    def test_helix_requests_are_refused_while_backing_off(self) -> None:
+        self.service.config.client_id = "abc123"
+        self.service.config.client_secret = "secret"
+        self.service._set_token("cached", time.time() + 3600)
+        self.service._backoff_until = time.time() + 30
+
+        with patch.object(self.service.session, "get") as get:
+            with self.assertRaises(requests.RequestException):
+                self.service.search_streamers("kai")
+            with self.assertRaises(requests.RequestException):
+                self.service.get_dashboard(["somebody_untracked"])
+
+        get.assert_not_called()
+
+    def test_429_without_budget_header_logs_the_status_code(self) -> None:
+        response = MagicMock(status_code=429, headers={})
+
+        with self.assertLogs("audience-signal-lab", "WARNING") as logs:
+            self.service._note_rate_limit(response)
+
+        self.assertIn("HTTP 429", logs.output[0])
+        self.assertNotIn("remaining", logs.output[0])
+
+    def test_discord_notifications_short_circuit_when_disabled(self) -> None:
+        self.service.config.enable_discord_notifications = False
+        self.service.config.discord_webhook = "https://discord.com/api/webhooks/1/abc"
+        with patch.object(self.service.session, "post") as post:
+            self.service._send_discord_alerts("kaicenat", "Kai Cenat", {}, {"title": "Live"}, [{"type": "went_live"}])
+
+        post.assert_not_called()
+
+    def test_discord_alerts_for_one_streamer_are_delivered_in_order(self) -> None:
+        self.service.config.enable_discord_notifications = True
+        self.service.config.discord_webhook = "https://discord.com/api/webhooks/1/abc"
+        events = [{"type": "went_live"}, {"type": "viewer_milestone", "message": "Passed 10,000 viewers."}]
+        delivered: list[str] = []
+
+        def slow_post(embed, webhook=None):
+            # Give a concurrently scheduled later embed every chance to overtake.
+            if not delivered:
+                time.sleep(0.05)
+            delivered.append(embed["title"])
+            return True
+
+        with patch.object(self.service, "_post_discord_embed", side_effect=slow_post):
+            self.service._send_discord_alerts("kaicenat", "Kai Cenat", {}, {"title": "Live"}, events)
+            self.service._io_pool.shutdown(wait=True)
+
+        self.assertEqual(delivered, ["🔴 Kai Cenat just went live", "📈 Kai Cenat hit a viewer milestone"])
+
+    def test_discord_embed_is_posted_as_serialized_json(self) -> None:
+        with patch.object(self.service.session, "post") as post:
+            delivered = self.service._post_discord_embed({"title": "Hi"}, "https://discord.com/api/webhooks/1/abc")
+
+        self.assertTrue(delivered)
+        kwargs = post.call_args.kwargs
+        self.assertEqual(json.loads(kwargs["data"]), {"embeds": [{"title": "Hi"}]})
+        self.assertEqual(kwargs["headers"]["Content-Type"], "application/json")
+
+
+class StreamStateStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "stream_state.json"
+
+    def update(self, store: StreamStateStore, **overrides) -> list[dict]:
+        values = {
+            "login": "kaicenat",
+            "display_name": "Kai Cenat",
+            "is_live": True,
+            "started_at": "2026-04-06T10:00:00Z",
+            "title": "Live show",
+            "game_name": "Just Chatting",
+            "viewer_count": 1200,
+            "thresholds": [1000],
+            "history_limit": 12,
+            "snapshot_limit": 72,
+            "event_limit": 30,
+        }
+        values.update(overrides)
+        return store.update(**values)
+
+    def test_updates_are_journaled_and_replayed_on_load(self) -> None:
+        store = StreamStateStore(self.path)
+        self.update(store)
+        self.update(store, viewer_count=1500)
+        self.update(store, is_live=False, started_at=None)
+
+        self.assertFalse(store.journal_path.exists())
+        store.flush()
+        self.assertFalse(self.path.exists())
+        self.assertEqual(len(store.journal_path.read_text(encoding="utf-8").splitlines()), 3)
+
+        reloaded = StreamStateStore(self.path)
+        self.assertEqual(reloaded.state, store.state)
+        self.assertEqual(reloaded.recent_sessions("kaicenat", 5)[0]["peak_viewers"], 1500)
+        self.assertEqual(
+            [event["type"] for event in reloaded.recent_events(10)],
+            ["went_offline", "viewer_milestone", "went_live"],
+        )
+
+    def test_restart_across_a_new_broadcast_closes_the_stale_session(self) -> None:
+        first_run = StreamStateStore(self.path)
+        self.update(first_run, viewer_count=900)
+        first_run.flush()
+
+        # Process restarts; meanwhile the old stream ended and a new one began.
+        store = StreamStateStore(self.path)
+        events = self.update(store, started_at="2026-04-07T18:00:00Z", viewer_count=800)
+        store.flush()
+
+        self.assertEqual([event["type"] for event in events], ["went_live"])
+        sessions = store.recent_sessions("kaicenat", 5)
+        self.assertEqual(len(sessions), 1)
+        self.assertEqual(sessions[0]["started_at"], "2026-04-06T10:00:00Z")
+        self.assertEqual(store.state["streams"]["kaicenat"]["session_started_at"], "2026-04-07T18:00:00Z")
+        self.assertEqual(store.state["streams"]["kaicenat"]["peak_viewers"], 800)
+
+        # A plain restart mid-stream must not re-announce the go-live.
+        restarted = StreamStateStore(self.path)
+        events = self.update(restarted, started_at="2026-04-07T18:00:00Z")
+        restarted.flush()
+        self.assertEqual([event["type"] for event in events], ["viewer_milestone"])
+
+    def test_torn_journal_tail_is_truncated_before_the_next_append(self) -> None:
+        store = StreamStateStore(self.path)
+        self.update(store)
+        store.flush()
+        with store.journal_path.open("ab") as handle:
+            handle.write(b'{"seq":2,"login":"kai')
+
+        recovered = StreamStateStore(self.path)
+        self.update(recovered, viewer_count=1500)
+        recovered.flush()
+
+        reloaded = StreamStateStore(self.path)
+        self.assertEqual(reloaded.state, recovered.state)
+        self.assertEqual(len(reloaded.recent_snapshots("kaicenat", 10)), 2)
+        self.assertEqual(reloaded.state["streams"]["kaicenat"]["last_viewer_count"], 1500)
+
+    def test_journal_lines_that_are_not_records_are_skipped(self) -> None:
+        store = StreamStateStore(self.path)
+        self.update(store)
+        store.flush()
+        with store.journal_path.open("ab") as handle:
+            handle.write(b'[]\nnull\n{"seq": 7}\n{"login": "kaicenat", "limits": 3}\n')
+
+        reloaded = StreamStateStore(self.path)
+
+        self.assertEqual(reloaded.state, store.state)
+
+    def test_interrupted_compaction_does_not_replay_records_twice(self) -> None:
+        store = StreamStateStore(self.path)
+        self.update(store)
+        self.update(store, viewer_count=1500)
+        store.flush()
+        journal = store.journal_path.read_bytes()
+
+        # Crash after the snapshot replaced the state file but before the
+        # journal was removed.
+        store._save()
+        store.journal_path.write_bytes(journal)
+
+        reloaded = StreamStateStore(self.path)
+        self.assertEqual(reloaded.state, store.state)
+        self.assertEqual(len(reloaded.recent_snapshots("kaicenat", 10)), 2)
+
+    def test_stores_are_flushed_at_exit_without_being_pinned(self) -> None:
+        store = StreamStateStore(self.path)
+        self.update(store)
+
+        twitch_checker.flush_state_stores()
+        self.assertEqual(len(store.journal_path.read_text(encoding="utf-8").splitlines()), 1)
+
+        journal_path = store.journal_path
+        del store
+        gc.collect()
+        self.assertFalse(any(open_store.journal_path == journal_path for open_store in twitch_checker._OPEN_STATE_STORES))
+
+    def test_unchanged_offline_updates_skip_the_journal(self) -> None:
+        store = StreamStateStore(self.path)
+        for _ in range(3):
+            self.update(store, is_live=False, started_at=None, title="", game_name="")
+        store.flush()
+
+        self.assertEqual(len(store.journal_path.read_text(encoding="utf-8").splitlines()), 1)
+        self.assertFalse(store.state["streams"]["kaicenat"]["is_live"])
+
+
 if __name__ == "__main__":
     unittest.main()
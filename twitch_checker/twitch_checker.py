@@ -1,35 +1,53 @@
 from __future__ import annotations
 
+import atexit
 import copy
+import importlib.util
 import json
 import logging
+import logging.handlers
 import os
 import re
 import secrets
+import sys
 import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import requests
 from dotenv import load_dotenv
 from flask import Flask, Response, jsonify, request, send_from_directory
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 try:
     from .database import get_recent_snapshots, log_chat_sentiment, log_stream_snapshot
-    from .ml_models import analyze_chat_sentiment, predict_peak_viewers
 
-    ML_AVAILABLE = True
+    DATABASE_AVAILABLE = True
 except ImportError:
     try:
         from database import get_recent_snapshots, log_chat_sentiment, log_stream_snapshot
-        from ml_models import analyze_chat_sentiment, predict_peak_viewers
 
-        ML_AVAILABLE = True
+        DATABASE_AVAILABLE = True
     except ImportError:
-        ML_AVAILABLE = False
+        DATABASE_AVAILABLE = False
+
+# ml_models pulls in numpy, pandas, scikit-learn and VADER, which dominate
+# startup time. Only check that they are installed here; the module itself is
+# imported on first use by load_ml_models().
+ML_DEPENDENCIES = ("numpy", "pandas", "sklearn", "vaderSentiment")
+ML_AVAILABLE = DATABASE_AVAILABLE and all(importlib.util.find_spec(name) for name in ML_DEPENDENCIES)
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 PACKAGE_DIR = Path(__file__).resolve().parent
@@ -38,10 +56,23 @@ CONFIG_PATH = PACKAGE_DIR / "config.json"
 SAMPLE_CONFIG_PATH = PACKAGE_DIR / "config.sample.json"
 DATA_DIR = BASE_DIR / "data"
 STATE_PATH = DATA_DIR / "stream_state.json"
+TOKEN_PATH = DATA_DIR / "twitch_token.json"
+JOURNAL_COMPACT_BYTES = 1_000_000
+LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+LOG_FLUSH_SECONDS = 5.0
 
 DEFAULT_TIMEOUT = 12
 TWITCH_OAUTH_URL = "https://id.twitch.tv/oauth2/token"
 TWITCH_API_BASE = "https://api.twitch.tv/helix"
+HELIX_BATCH_SIZE = 100
+# The only /streams fields the dashboard reads; tags, ids, language etc. are dropped.
+STREAM_FIELDS = ("user_login", "title", "game_name", "viewer_count", "started_at", "thumbnail_url")
+RATE_LIMIT_FLOOR = 50
+MAX_BACKOFF_SECONDS = 300
+DISCORD_JSON_HEADERS = {"Content-Type": "application/json"}
+DISCORD_COLOR_LIVE = 15105570
+DISCORD_COLOR_MILESTONE = 3447003
+DISCORD_COLOR_CONNECTED = 5763719
 DEFAULT_ALERT_THRESHOLDS = [1000, 5000, 10000, 25000, 50000, 100000]
 DEFAULT_STREAMERS = [
     "kaicenat",
@@ -66,6 +97,64 @@ DEFAULT_GROUPS = {
 LOGIN_RE = re.compile(r"^[a-z0-9_]{3,25}$")
 
 
+def decode_json(raw: str | bytes) -> Any:
+    """Parse JSON with orjson when installed; errors are json.JSONDecodeError either way."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def encode_json(value: Any, indent: bool = False) -> str:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+    if indent:
+        return json.dumps(value, indent=2)
+    return json.dumps(value, separators=(",", ":"))
+
+
+@lru_cache(maxsize=None)
+def load_ml_models() -> Any:
+    """Import ml_models on first use, or return None if it can't be imported.
+
+    ``find_spec`` only proves the dependencies are installed; a broken wheel
+    still fails here. In that case ML is switched off for the process (logged
+    once, since the None result is cached) rather than failing every request.
+    """
+    global ML_AVAILABLE
+    try:
+        try:
+            from . import ml_models
+        except ImportError:
+            import ml_models
+    except ImportError as exc:
+        logging.getLogger("audience-signal-lab").warning("ML helpers disabled, ml_models failed to import: %s", exc)
+        ML_AVAILABLE = False
+        return None
+    return ml_models
+
+
+def build_http_session() -> requests.Session:
+    """Pooled keep-alive session shared by Twitch and Discord calls.
+
+    Idempotent GETs are retried on connection errors and 5xx with a short
+    backoff; POSTs are not, so a flaky webhook never delivers the same alert
+    twice. 429s are left to ``TwitchService._note_rate_limit``, which waits for
+    Helix's ``Ratelimit-Reset`` instead of spending more requests, and read
+    timeouts are not retried so a hung call can't hold the dashboard cache
+    lock for several timeouts in a row.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=[500, 502, 503, 504],
+        raise_on_status=False,
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    return session
+
+
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
@@ -74,9 +163,28 @@ def utc_now_iso() -> str:
     return utc_now().isoformat()
 
 
+@lru_cache(maxsize=4096)
 def parse_timestamp(value: str | None) -> datetime | None:
+    # The same started_at/snapshot stamps are parsed on every rebuild, and
+    # datetimes are immutable, so results are memoized.
     if not value:
         return None
+    if (
+        len(value) == 20
+        and value[4] == value[7] == "-"
+        and value[10] == "T"
+        and value[13] == value[16] == ":"
+        and value[19] == "Z"
+    ):
+        # Helix's fixed RFC 3339 shape, e.g. 2026-04-06T12:00:00Z. int() would
+        # also take signs, spaces and non-ASCII digits, so each field must be
+        # plain ASCII digits; anything else goes through fromisoformat.
+        fields = (value[0:4], value[5:7], value[8:10], value[11:13], value[14:16], value[17:19])
+        if all(field.isascii() and field.isdigit() for field in fields):
+            try:
+                return datetime(*map(int, fields), tzinfo=timezone.utc)
+            except ValueError:
+                return None
     try:
         return datetime.fromisoformat(value.replace("Z", "+00:00"))
     except ValueError:
@@ -119,7 +227,7 @@ def load_json_file(path: Path) -> dict[str, Any]:
     if not path.exists():
         return {}
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return decode_json(path.read_bytes())
     except json.JSONDecodeError:
         return {}
 
@@ -206,6 +314,10 @@ def compact_text(value: str, limit: int = 120) -> str:
     return value[: limit - 1].rstrip() + "..."
 
 
+def chunked(items: list[str], size: int) -> list[list[str]]:
+    return [items[index : index + size] for index in range(0, len(items), size)]
+
+
 def sort_take(items: list[dict[str, Any]], key: str, limit: int = 5) -> list[dict[str, Any]]:
     return sorted(items, key=lambda item: item.get(key, 0), reverse=True)[:limit]
 
@@ -251,7 +363,7 @@ class AppConfig:
             "alert_thresholds": self.alert_thresholds,
             "frontend_title": self.frontend_title,
         }
-        CONFIG_PATH.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        CONFIG_PATH.write_text(encode_json(payload, indent=True), encoding="utf-8")
 
 
 def load_config() -> AppConfig:
@@ -288,24 +400,117 @@ def load_config() -> AppConfig:
     )
 
 
+# Stores with possibly-unflushed journal records. Held weakly so creating a
+# service (every create_app(), every test) doesn't pin its store forever, and
+# flushed by a single exit hook instead of one registration per instance.
+_OPEN_STATE_STORES: weakref.WeakSet[StreamStateStore] = weakref.WeakSet()
+
+
+def flush_state_stores() -> None:
+    for store in list(_OPEN_STATE_STORES):
+        store.flush()
+
+
+atexit.register(flush_state_stores)
+
+
 class StreamStateStore:
+    """Stream state persisted as a JSON snapshot plus an append-only journal.
+
+    Each ``update`` queues one compact record describing what changed for a
+    single login; ``flush`` appends everything queued in one write, once per
+    dashboard rebuild and at exit. The journal is replayed on load and folded
+    back into the snapshot once it grows past ``JOURNAL_COMPACT_BYTES``.
+
+    Records carry an increasing ``seq`` and the snapshot remembers the last one
+    it contains, so replaying a journal that survived a crash mid-compaction
+    doesn't apply anything twice.
+    """
+
     def __init__(self, path: Path):
         self.path = path
+        self.journal_path = path.with_suffix(".jsonl")
         self.lock = threading.Lock()
+        self._pending: list[str] = []
+        self._seq = 0
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self.state = self._load_state()
+        _OPEN_STATE_STORES.add(self)
 
     def _default_state(self) -> dict[str, Any]:
         return {"streams": {}, "history": {}, "snapshots": {}, "events": []}
 
     def _load_state(self) -> dict[str, Any]:
         data = load_json_file(self.path)
-        if not all(key in data for key in ("streams", "history", "snapshots", "events")):
-            return self._default_state()
+        if not isinstance(data, dict) or not all(key in data for key in ("streams", "history", "snapshots", "events")):
+            data = self._default_state()
+        snapshot_seq = parse_int(data.pop("journal_seq", 0), 0)
+        self._seq = snapshot_seq
+        if not self.journal_path.exists():
+            return data
+
+        good_offset = 0
+        with self.journal_path.open("rb") as handle:
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    # Torn final line from a crash mid-write.
+                    break
+                good_offset += len(line)
+                try:
+                    record = decode_json(line)
+                except ValueError:
+                    continue
+                if not isinstance(record, dict):
+                    continue
+                seq = parse_int(record.get("seq"), 0)
+                if seq and seq <= snapshot_seq:
+                    # Already folded into the snapshot by an interrupted compaction.
+                    continue
+                try:
+                    self._apply(data, record)
+                except (AttributeError, KeyError, TypeError, ValueError):
+                    # Decodes, but isn't a record we wrote; skip it like bad JSON.
+                    continue
+                self._seq = max(self._seq, seq)
+        if good_offset < self.journal_path.stat().st_size:
+            # Cut the torn tail so the next append starts on a fresh line
+            # instead of being glued onto the fragment and lost.
+            with self.journal_path.open("r+b") as handle:
+                handle.truncate(good_offset)
         return data
 
+    def _apply(self, state: dict[str, Any], record: dict[str, Any]) -> None:
+        # Replayed logins come from our own journal, not from clients, so
+        # interning them is bounded by the watchlist.
+        login = sys.intern(record["login"])
+        snapshot_limit, history_limit, event_limit = record["limits"]
+        state["streams"][login] = record["stream"]
+        if record.get("snapshot"):
+            points = state["snapshots"].setdefault(login, [])
+            points.append(record["snapshot"])
+            state["snapshots"][login] = self._trim_tail(points, snapshot_limit)
+        if record.get("session"):
+            sessions = state["history"].setdefault(login, [])
+            sessions.append(record["session"])
+            state["history"][login] = self._trim_tail(sessions, history_limit)
+        if record.get("events"):
+            state["events"] = self._trim_tail(state["events"] + record["events"], event_limit)
+
+    def flush(self) -> None:
+        with self.lock:
+            if not self._pending:
+                return
+            with self.journal_path.open("a", encoding="utf-8") as handle:
+                handle.writelines(self._pending)
+            self._pending.clear()
+            if self.journal_path.stat().st_size > JOURNAL_COMPACT_BYTES:
+                self._save()
+
     def _save(self) -> None:
-        self.path.write_text(json.dumps(self.state, indent=2), encoding="utf-8")
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_text(encode_json({**self.state, "journal_seq": self._seq}, indent=True), encoding="utf-8")
+        temp_path.replace(self.path)
+        self.journal_path.unlink(missing_ok=True)
 
     def _trim_tail(self, items: list[dict[str, Any]], limit: int) -> list[dict[str, Any]]:
         return items if len(items) <= limit else items[-limit:]
@@ -399,14 +604,30 @@ class StreamStateStore:
         event_limit: int,
     ) -> list[dict[str, Any]]:
         with self.lock:
-            streams = self.state.setdefault("streams", {})
-            history = self.state.setdefault("history", {})
-            snapshots = self.state.setdefault("snapshots", {})
-            events = self.state.setdefault("events", [])
-
-            previous = streams.get(login, {"is_live": False})
+            previous = self.state["streams"].get(login, {"is_live": False})
             now_iso = utc_now_iso()
             generated_events: list[dict[str, Any]] = []
+            snapshot: dict[str, Any] | None = None
+            session: dict[str, Any] | None = None
+
+            if (
+                not is_live
+                and not previous.get("is_live")
+                and login in self.state["streams"]
+                and (previous.get("title"), previous.get("game_name"), previous.get("display_name"))
+                == (title, game_name, display_name)
+            ):
+                # Still offline with nothing new to record: refresh in memory
+                # only, so idle channels don't add a journal line every tick.
+                previous["last_seen_at"] = now_iso
+                return generated_events
+
+            if is_live and self._is_new_session(previous, started_at):
+                # The stored session ended and another began while we weren't
+                # polling (typically across a restart). Close the old one at
+                # its last sighting so the new stream isn't merged into it.
+                session = self._close_session(previous, previous.get("last_seen_at") or now_iso)
+                previous = {"is_live": False}
 
             if is_live:
                 session_started_at = started_at or previous.get("session_started_at") or now_iso
@@ -450,17 +671,13 @@ class StreamStateStore:
                         )
                     )
 
-                snapshots.setdefault(login, []).append(
-                    {
-                        "timestamp": now_iso,
-                        "viewers": viewer_count,
-                        "game_name": game_name,
-                        "title": compact_text(title, 90),
-                    }
-                )
-                snapshots[login] = self._trim_tail(snapshots[login], snapshot_limit)
-
-                streams[login] = {
+                snapshot = {
+                    "timestamp": now_iso,
+                    "viewers": viewer_count,
+                    "game_name": game_name,
+                    "title": compact_text(title, 90),
+                }
+                stream = {
                     "is_live": True,
                     "session_started_at": session_started_at,
                     "last_seen_at": now_iso,
@@ -474,23 +691,8 @@ class StreamStateStore:
                 }
             else:
                 if previous.get("is_live"):
-                    ended_at = now_iso
-                    session_duration = duration_minutes(previous.get("session_started_at"), ended_at)
-                    history.setdefault(login, []).append(
-                        {
-                            "started_at": previous.get("session_started_at"),
-                            "ended_at": ended_at,
-                            "title": previous.get("title", ""),
-                            "game_name": previous.get("game_name", ""),
-                            "avg_viewers": round(
-                                parse_int(previous.get("viewer_sum", 0), 0)
-                                / max(parse_int(previous.get("snapshot_count", 1), 1), 1)
-                            ),
-                            "peak_viewers": parse_int(previous.get("peak_viewers", 0), 0),
-                            "duration_minutes": session_duration,
-                        }
-                    )
-                    history[login] = self._trim_tail(history[login], max(history_limit * 8, history_limit))
+                    session = self._close_session(previous, now_iso)
+                    session_duration = session["duration_minutes"]
                     generated_events.append(
                         self._build_event(
                             login=login,
@@ -502,7 +704,7 @@ class StreamStateStore:
                         )
                     )
 
-                streams[login] = {
+                stream = {
                     "is_live": False,
                     "session_started_at": None,
                     "last_seen_at": now_iso,
@@ -515,11 +717,38 @@ class StreamStateStore:
                     "display_name": display_name,
                 }
 
-            events.extend(generated_events)
-            self.state["events"] = self._trim_tail(events, event_limit)
-            self._save()
+            self._seq += 1
+            record = {
+                "seq": self._seq,
+                "login": login,
+                "stream": stream,
+                "snapshot": snapshot,
+                "session": session,
+                "events": generated_events,
+                "limits": [snapshot_limit, max(history_limit * 8, history_limit), event_limit],
+            }
+            self._apply(self.state, record)
+            self._pending.append(encode_json(record) + "\n")
             return generated_events
 
+    def _is_new_session(self, previous: dict[str, Any], started_at: str | None) -> bool:
+        previous_start = parse_timestamp(previous.get("session_started_at"))
+        current_start = parse_timestamp(started_at)
+        return bool(previous.get("is_live") and previous_start and current_start and previous_start != current_start)
+
+    def _close_session(self, previous: dict[str, Any], ended_at: str) -> dict[str, Any]:
+        return {
+            "started_at": previous.get("session_started_at"),
+            "ended_at": ended_at,
+            "title": previous.get("title", ""),
+            "game_name": previous.get("game_name", ""),
+            "avg_viewers": round(
+                parse_int(previous.get("viewer_sum", 0), 0) / max(parse_int(previous.get("snapshot_count", 1), 1), 1)
+            ),
+            "peak_viewers": parse_int(previous.get("peak_viewers", 0), 0),
+            "duration_minutes": duration_minutes(previous.get("session_started_at"), ended_at),
+        }
+
     def _crossed_threshold(self, previous_peak: int, current_peak: int, thresholds: list[int]) -> int | None:
         crossed = [threshold for threshold in thresholds if previous_peak < threshold <= current_peak]
         return max(crossed, default=None)
@@ -552,13 +781,21 @@ class TwitchService:
     def __init__(self, config: AppConfig, logger: logging.Logger):
         self.config = config
         self.logger = logger
-        self.session = requests.Session()
+        self.session = build_http_session()
         self.access_token = ""
         self.token_expires_at = 0.0
+        self._headers: dict[str, str] = {}
+        self._token_lock = threading.Lock()
+        self._fetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="helix")
+        # Webhook deliveries run off the request thread so a slow Discord
+        # response never holds up the dashboard rebuild.
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="io")
         self.state_store = StreamStateStore(STATE_PATH)
         self._cache_lock = threading.Lock()
         self._dashboard_cache: dict[str, Any] | None = None
-        self._dashboard_cached_at = 0.0
+        self._dashboard_cached_at: float | None = None
+        self._backoff_until = 0.0
+        self._error_backoff = 0
 
     def config_error(self) -> str | None:
         if self.config.is_configured:
@@ -566,9 +803,9 @@ class TwitchService:
         return "Twitch credentials are missing. Add them to twitch_checker/config.json or .env."
 
     def cache_age_seconds(self) -> int | None:
-        if not self._dashboard_cached_at:
+        if self._dashboard_cached_at is None:
             return None
-        return int(max(time.time() - self._dashboard_cached_at, 0))
+        return int(max(time.monotonic() - self._dashboard_cached_at, 0))
 
     def cache_status(self) -> dict[str, Any]:
         age_seconds = self.cache_age_seconds()
@@ -583,7 +820,7 @@ class TwitchService:
     def invalidate_cache(self) -> None:
         with self._cache_lock:
             self._dashboard_cache = None
-            self._dashboard_cached_at = 0.0
+            self._dashboard_cached_at = None
 
     def ensure_token(self, force_refresh: bool = False) -> None:
         error = self.config_error()
@@ -593,28 +830,77 @@ class TwitchService:
         if not force_refresh and self.access_token and time.time() < self.token_expires_at:
             return
 
-        response = self.session.post(
-            TWITCH_OAUTH_URL,
-            params={
-                "client_id": self.config.client_id,
-                "client_secret": self.config.client_secret,
-                "grant_type": "client_credentials",
-            },
-            timeout=DEFAULT_TIMEOUT,
-        )
-        response.raise_for_status()
-        payload = response.json()
-        self.access_token = payload["access_token"]
-        self.token_expires_at = time.time() + max(int(payload.get("expires_in", 0)) - 120, 60)
+        with self._token_lock:
+            # Concurrent Helix lookups can race here; only the first refreshes.
+            if not force_refresh and self.access_token and time.time() < self.token_expires_at:
+                return
+            if not force_refresh and self._load_cached_token():
+                return
+            response = self.session.post(
+                TWITCH_OAUTH_URL,
+                params={
+                    "client_id": self.config.client_id,
+                    "client_secret": self.config.client_secret,
+                    "grant_type": "client_credentials",
+                },
+                timeout=DEFAULT_TIMEOUT,
+            )
+            response.raise_for_status()
+            payload = decode_json(response.content)
+            self._set_token(payload["access_token"], time.time() + max(int(payload.get("expires_in", 0)) - 120, 60))
+            self._save_cached_token()
+
+    def _load_cached_token(self) -> bool:
+        # App tokens live for ~60 days; reuse one from a previous run instead
+        # of minting a new token on every restart. A 401 still forces refresh.
+        # Anything malformed is a cache miss, never an outage.
+        try:
+            cached = load_json_file(TOKEN_PATH)
+            access_token = cached.get("access_token")
+            expires_at = float(cached.get("expires_at", 0) or 0)
+        except (AttributeError, TypeError, ValueError, OSError):
+            return False
+        if cached.get("client_id") != self.config.client_id or not isinstance(access_token, str) or not access_token:
+            return False
+        if expires_at <= time.time():
+            return False
+        self._set_token(access_token, expires_at)
+        return True
+
+    def _set_token(self, access_token: str, expires_at: float) -> None:
+        self.access_token = access_token
+        self.token_expires_at = expires_at
+        # Built once per token rather than on every Helix call.
+        self._headers = {
+            "Client-ID": self.config.client_id,
+            "Authorization": f"Bearer {access_token}",
+        }
+
+    def _save_cached_token(self) -> None:
+        payload = {
+            "client_id": self.config.client_id,
+            "access_token": self.access_token,
+            "expires_at": self.token_expires_at,
+        }
+        try:
+            TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
+            # The bearer token is a credential; keep it owner-only.
+            descriptor = os.open(TOKEN_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+                handle.write(encode_json(payload))
+            os.chmod(TOKEN_PATH, 0o600)
+        except OSError as exc:
+            self.logger.warning("Could not cache Twitch app token: %s", exc)
 
     def _request(self, endpoint: str, params: list[tuple[str, str]] | None = None) -> dict[str, Any]:
+        if time.time() < self._backoff_until:
+            # Every Helix caller (untracked dashboards, search, clips, watchlist
+            # adds) shares the bucket, so none of them spend it while throttled.
+            raise requests.RequestException("Twitch requests are paused until the rate limit resets")
         self.ensure_token()
         response = self.session.get(
             f"{TWITCH_API_BASE}/{endpoint}",
-            headers={
-                "Client-ID": self.config.client_id,
-                "Authorization": f"Bearer {self.access_token}",
-            },
+            headers=self._headers,
             params=params,
             timeout=DEFAULT_TIMEOUT,
         )
@@ -624,16 +910,29 @@ class TwitchService:
             self.ensure_token(force_refresh=True)
             response = self.session.get(
                 f"{TWITCH_API_BASE}/{endpoint}",
-                headers={
-                    "Client-ID": self.config.client_id,
-                    "Authorization": f"Bearer {self.access_token}",
-                },
+                headers=self._headers,
                 params=params,
                 timeout=DEFAULT_TIMEOUT,
             )
 
+        self._note_rate_limit(response)
         response.raise_for_status()
-        return response.json()
+        return decode_json(response.content)
+
+    def _note_rate_limit(self, response: requests.Response) -> None:
+        # Helix reports the remaining points in the current bucket and the
+        # epoch second it refills. Near the floor (or on 429), hold off until
+        # the reset instead of spending requests that will be rejected.
+        header = response.headers.get("Ratelimit-Remaining")
+        remaining = parse_int(header, RATE_LIMIT_FLOOR)
+        if response.status_code != 429 and remaining >= RATE_LIMIT_FLOOR:
+            return
+        reset_at = parse_int(response.headers.get("Ratelimit-Reset"), 0) or time.time() + 30
+        self._backoff_until = max(self._backoff_until, min(reset_at, time.time() + MAX_BACKOFF_SECONDS))
+        if header is None:
+            self.logger.warning("Twitch returned HTTP %s; backing off until the rate limit resets", response.status_code)
+        else:
+            self.logger.warning("Twitch rate limit is low (%s remaining); backing off until reset", remaining)
 
     def get_config(self) -> dict[str, Any]:
         return {
@@ -1811,13 +2110,34 @@ class TwitchService:
     def _get_cached_dashboard(self, force_refresh: bool = False) -> dict[str, Any]:
         with self._cache_lock:
             ttl_seconds = max(min(self.config.check_interval, 120), 15)
-            is_fresh = self._dashboard_cache is not None and (time.time() - self._dashboard_cached_at) < ttl_seconds
+            is_fresh = (
+                self._dashboard_cache is not None
+                and self._dashboard_cached_at is not None
+                and (time.monotonic() - self._dashboard_cached_at) < ttl_seconds
+            )
             if not force_refresh and is_fresh:
                 return copy.deepcopy(self._dashboard_cache)
+            if self._dashboard_cache is not None and time.time() < self._backoff_until:
+                # Throttled or recovering from errors: serve the last good board.
+                return copy.deepcopy(self._dashboard_cache)
 
-            dashboard = self._build_dashboard(self.config.streamers)
+            # Stamp the cache with the build *start* on the monotonic clock so
+            # the refresh cadence stays at ttl_seconds instead of stretching by
+            # however long the Twitch round-trips took, and wall-clock jumps
+            # can't make the cache look fresh or stale.
+            started = time.monotonic()
+            try:
+                dashboard = self._build_dashboard(self.config.streamers)
+            except requests.RequestException:
+                self._error_backoff = min(max(self._error_backoff * 2, ttl_seconds), MAX_BACKOFF_SECONDS)
+                self._backoff_until = max(self._backoff_until, time.time() + self._error_backoff)
+                raise
+            self._error_backoff = 0
+            elapsed = time.monotonic() - started
+            if elapsed > ttl_seconds:
+                self.logger.warning("Dashboard rebuild took %.1fs, longer than the %ss refresh window", elapsed, ttl_seconds)
             self._dashboard_cache = dashboard
-            self._dashboard_cached_at = time.time()
+            self._dashboard_cached_at = started
             return copy.deepcopy(dashboard)
 
     def _slice_dashboard(self, dashboard: dict[str, Any], logins: list[str]) -> dict[str, Any]:
@@ -1845,8 +2165,11 @@ class TwitchService:
         if error:
             raise RuntimeError(error)
 
-        users = self._fetch_users(requested_logins)
+        # /users and /streams are independent, so overlap the two round-trips.
+        self.ensure_token()
+        users_future = self._fetch_pool.submit(self._fetch_users, requested_logins)
         streams = self._fetch_streams(requested_logins)
+        users = users_future.result()
 
         cards: list[dict[str, Any]] = []
         analytics_map: dict[str, dict[str, Any]] = {}
@@ -1874,16 +2197,14 @@ class TwitchService:
                 event_limit=self.config.event_limit,
             )
 
-            if any(event["type"] == "went_live" for event in generated_events):
-                self._send_discord_notification(login, display_name, user, stream)
-            for event in generated_events:
-                if event["type"] == "viewer_milestone":
-                    self._send_discord_milestone(login, display_name, event)
+            if generated_events:
+                self._send_discord_alerts(login, display_name, user, stream, generated_events)
 
-            if ML_AVAILABLE and is_live:
+            ml_models = load_ml_models() if ML_AVAILABLE and is_live else None
+            if ml_models is not None:
                 log_stream_snapshot(login, viewer_count, game_name, title)
                 demo_messages = ["pog", "w stream", "hype"] if viewer_count > 10000 else ["nice", "steady stream"]
-                sentiment_data = analyze_chat_sentiment(demo_messages)
+                sentiment_data = ml_models.analyze_chat_sentiment(demo_messages)
                 log_chat_sentiment(login, sentiment_data["score"], len(demo_messages))
 
             card = {
@@ -1911,6 +2232,7 @@ class TwitchService:
             cards.append(card)
             analytics_map[login] = analytics
 
+        self.state_store.flush()
         return {
             "generated_at": utc_now_iso(),
             "title": self.config.frontend_title,
@@ -1930,13 +2252,31 @@ class TwitchService:
             "compare_defaults": requested_logins[: min(4, len(requested_logins))],
         }
 
+    def _fetch_batched(
+        self,
+        endpoint: str,
+        param: str,
+        key: str,
+        logins: list[str],
+        fields: tuple[str, ...] | None = None,
+    ) -> dict[str, dict[str, Any]]:
+        # Helix accepts at most 100 repeated login params per request, so a
+        # large watchlist becomes ceil(N / 100) calls instead of a 400.
+        results: dict[str, dict[str, Any]] = {}
+        for batch in chunked(logins, HELIX_BATCH_SIZE):
+            payload = self._request(endpoint, [(param, login) for login in batch])
+            for item in payload.get("data", []):
+                if fields:
+                    item = {field: item[field] for field in fields if field in item}
+                results[item[key].lower()] = item
+        return results
+
     def _fetch_users(self, logins: list[str]) -> dict[str, dict[str, Any]]:
-        payload = self._request("users", [("login", login) for login in logins])
-        return {item["login"].lower(): item for item in payload.get("data", [])}
+        return self._fetch_batched("users", "login", "login", logins)
 
     def _fetch_streams(self, logins: list[str]) -> dict[str, dict[str, Any]]:
-        payload = self._request("streams", [("user_login", login) for login in logins])
-        return {item["user_login"].lower(): item for item in payload.get("data", [])}
+        # Only live channels come back; anything missing is treated as offline.
+        return self._fetch_batched("streams", "user_login", "user_login", logins, STREAM_FIELDS)
 
     def _build_overview(self, cards: list[dict[str, Any]], analytics_map: dict[str, dict[str, Any]]) -> dict[str, Any]:
         live_cards = [card for card in cards if card["is_live"]]
@@ -2093,47 +2433,65 @@ class TwitchService:
         if not target:
             return False
         try:
-            response = self.session.post(target, json={"embeds": [embed]}, timeout=DEFAULT_TIMEOUT)
+            body = encode_json({"embeds": [embed]}).encode("utf-8")
+            response = self.session.post(target, data=body, headers=DISCORD_JSON_HEADERS, timeout=DEFAULT_TIMEOUT)
             response.raise_for_status()
             return True
         except requests.RequestException as exc:
             self.logger.warning("Discord webhook post failed: %s", exc)
             return False
 
-    def _send_discord_notification(
+    def _post_discord_embeds(self, embeds: list[dict[str, Any]]) -> None:
+        # One worker task per streamer, posted in order, so "hit a milestone"
+        # can never reach the channel ahead of "just went live".
+        for embed in embeds:
+            self._post_discord_embed(embed)
+
+    def _send_discord_alerts(
         self,
         login: str,
         display_name: str,
         user: dict[str, Any],
         stream: dict[str, Any],
+        events: list[dict[str, Any]],
     ) -> None:
         if not self.config.enable_discord_notifications or not self.config.discord_webhook:
             return
-        self._post_discord_embed(
-            {
-                "title": f"🔴 {display_name} just went live",
-                "description": stream.get("title", "Live on Twitch"),
-                "url": f"https://www.twitch.tv/{login}",
-                "color": 15105570,
-                "fields": [
-                    {"name": "Category", "value": stream.get("game_name") or "Unknown", "inline": True},
-                    {"name": "Viewers", "value": str(stream.get("viewer_count", 0)), "inline": True},
-                ],
-                "thumbnail": {"url": user.get("profile_image_url", "")},
-            }
-        )
+        embeds: list[dict[str, Any]] = []
+        if any(event["type"] == "went_live" for event in events):
+            embeds.append(self._discord_live_embed(login, display_name, user, stream))
+        for event in events:
+            if event["type"] == "viewer_milestone":
+                embeds.append(self._discord_milestone_embed(login, display_name, event))
+        if embeds:
+            self._io_pool.submit(self._post_discord_embeds, embeds)
+
+    def _discord_live_embed(
+        self,
+        login: str,
+        display_name: str,
+        user: dict[str, Any],
+        stream: dict[str, Any],
+    ) -> dict[str, Any]:
+        return {
+            "title": f"🔴 {display_name} just went live",
+            "description": stream.get("title", "Live on Twitch"),
+            "url": f"https://www.twitch.tv/{login}",
+            "color": DISCORD_COLOR_LIVE,
+            "fields": [
+                {"name": "Category", "value": stream.get("game_name") or "Unknown", "inline": True},
+                {"name": "Viewers", "value": str(stream.get("viewer_count", 0)), "inline": True},
+            ],
+            "thumbnail": {"url": user.get("profile_image_url", "")},
+        }
 
-    def _send_discord_milestone(self, login: str, display_name: str, event: dict[str, Any]) -> None:
-        if not self.config.enable_discord_notifications or not self.config.discord_webhook:
-            return
-        self._post_discord_embed(
-            {
-                "title": f"📈 {display_name} hit a viewer milestone",
-                "description": event.get("message", "Viewer milestone reached."),
-                "url": f"https://www.twitch.tv/{login}",
-                "color": 3447003,
-            }
-        )
+    def _discord_milestone_embed(self, login: str, display_name: str, event: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "title": f"📈 {display_name} hit a viewer milestone",
+            "description": event.get("message", "Viewer milestone reached."),
+            "url": f"https://www.twitch.tv/{login}",
+            "color": DISCORD_COLOR_MILESTONE,
+        }
 
     def discord_status(self) -> dict[str, Any]:
         webhook = (self.config.discord_webhook or "").strip()
@@ -2168,7 +2526,7 @@ class TwitchService:
             {
                 "title": "✅ KC Live is connected",
                 "description": "This channel will now receive go-live and viewer-milestone alerts for your tracked streamers.",
-                "color": 5763719,
+                "color": DISCORD_COLOR_CONNECTED,
             }
         )
         if not ok:
@@ -2176,9 +2534,39 @@ class TwitchService:
         return {"ok": True, "detail": "Test message delivered to Discord."}
 
 
+def build_buffered_file_handler(path: Path) -> logging.handlers.MemoryHandler:
+    """File logging that batches records instead of writing each one.
+
+    Records are held until 64 accumulate, an ERROR arrives, or the periodic
+    flush fires, so at most ``LOG_FLUSH_SECONDS`` of logs sit in memory.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file_handler = logging.FileHandler(path, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    buffered = logging.handlers.MemoryHandler(
+        capacity=64,
+        flushLevel=logging.ERROR,
+        target=file_handler,
+        flushOnClose=True,
+    )
+
+    def flush_periodically() -> None:
+        while True:
+            time.sleep(LOG_FLUSH_SECONDS)
+            buffered.flush()
+
+    threading.Thread(target=flush_periodically, name="log-flush", daemon=True).start()
+    atexit.register(buffered.close)
+    return buffered
+
+
 def build_logger() -> logging.Logger:
-    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
-    return logging.getLogger("audience-signal-lab")
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    logger = logging.getLogger("audience-signal-lab")
+    log_file = os.getenv("LOG_FILE", "").strip()
+    if log_file and not any(isinstance(handler, logging.handlers.MemoryHandler) for handler in logger.handlers):
+        logger.addHandler(build_buffered_file_handler(Path(log_file)))
+    return logger
 
 
 def create_app() -> Flask:
@@ -2356,14 +2744,15 @@ def create_app() -> Flask:
         normalized = normalize_login(login)
         if not normalized:
             return jsonify({"error": "invalid_login", "detail": "Invalid Twitch login."}), 400
-        if not ML_AVAILABLE:
+        ml_models = load_ml_models() if ML_AVAILABLE else None
+        if ml_models is None:
             return jsonify({"status": "ml_not_enabled", "login": normalized}), 501
 
         data_points = service.prediction_data_for_login(normalized, 60)
         if not data_points:
             return jsonify({"status": "no_data_in_db", "login": normalized})
 
-        prediction = predict_peak_viewers(data_points)
+        prediction = ml_models.predict_peak_viewers(data_points)
         return jsonify({"login": normalized, "data_points_used": len(data_points), **prediction})
 
     @app.get("/api/ml/model-card/<login>")
@@ -2376,14 +2765,15 @@ def create_app() -> Flask:
         normalized = normalize_login(login)
         if not normalized:
             return jsonify({"error": "invalid_login", "detail": "Invalid Twitch login."}), 400
-        if not ML_AVAILABLE:
+        ml_models = load_ml_models() if ML_AVAILABLE else None
+        if ml_models is None:
             return jsonify({"status": "ml_not_enabled", "login": normalized}), 501
 
         data_points = service.prediction_data_for_login(normalized, 60)
         if not data_points:
             return jsonify({"status": "no_data_in_db", "login": normalized})
 
-        prediction = predict_peak_viewers(data_points)
+        prediction = ml_models.predict_peak_viewers(data_points)
         if prediction.get("status") != "success":
             return jsonify({"login": normalized, **prediction})
 